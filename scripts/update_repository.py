@@ -1,18 +1,22 @@
 #!/usr/bin/env python3
-from gettext import find
-import json
+import orjson
 import logging
 import asyncio
-import aiohttp
+import hashlib
+import heapq
+import httpx
 import sys
 import re
-from bs4 import BeautifulSoup
-from datetime import datetime
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
 from packaging.version import parse as parse_version, Version, InvalidVersion
-from crontab import CronTab
-from tqdm import tqdm
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,16 +26,42 @@ logging.basicConfig(
         logging.FileHandler(Path(__file__).parent / 'update_repository.log')
     ]
 )
+# httpx默认为每个请求输出一条INFO日志, 只保留警告及以上
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 def is_zip_file(file_path: str) -> bool:
     return file_path.endswith('.zip') or file_path.endswith('.tar.gz')
 
+@lru_cache(maxsize=4096)
+def version_key(version: str) -> Version:
+    """解析版本号用于排序, 兼容v前缀, 结果按版本字符串缓存"""
+    return parse_version(version[1:] if version.startswith('v') else version)
+
 class VersionFetcher:
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
         self.max_versions_per_platform = 5  # 每个平台最多保留的版本数
         self.max_links_to_process = 150  # 每个环境最多处理的链接数
-        self.timeout = aiohttp.ClientTimeout(total=5)
+        # 所有环境共享同一个HTTP客户端, 复用keep-alive连接和HTTP/2多路复用
+        self.client = client
+        # 每个域名最多同时进行的请求数, 避免触发源站限流导致大量超时
+        self.max_requests_per_host = 8
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # 连接错误和服务器临时故障(5xx/429)的重试次数及退避基数(秒)
+        self.max_retries = 2
+        self.retry_backoff = 0.5
+        self.retry_statuses = {429, 500, 502, 503, 504}
+        # 不支持HEAD请求的域名, 直接使用 Range: bytes=0-0 的GET请求验证
+        self.head_unsupported_hosts = {"mirrors.aliyun.com"}
+        # 正在验证或已验证的链接, 多个平台共用同一下载链接时只请求一次
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 有效下载链接的缓存, 跨运行持久化, 有效期内不再重复请求; 无效结果不缓存, 避免临时故障隐藏链接
+        self.url_cache_file = Path(__file__).parent / '.url_cache.json'
+        self.url_cache_ttl = 24 * 60 * 60
+        self.url_cache: Dict[str, dict] = self._load_url_cache()
+        # 抓取网页的本地缓存目录, 配合ETag/Last-Modified避免重复下载未变化的页面
+        self.page_cache_dir = Path(__file__).parent / '.cache'
         # 定义平台标识符
         self.os_identifiers = {
             "windows": ["windows", "win"],
@@ -69,6 +99,8 @@ class VersionFetcher:
         self.env_configs = {
             "java": {
                 "type": "fixed_versions",
+                # 模板链接来自官方固定地址, 无需逐个验证
+                "verify": False,
                 "versions": [21, 17, 11, 8],
                 "url_template": {
                     "windows-x64": "https://corretto.aws/downloads/latest/amazon-corretto-{version}-x64-windows-jdk.zip",
@@ -80,6 +112,7 @@ class VersionFetcher:
             },
             "node": {
                 "type": "fixed_versions",
+                "verify": False,
                 "versions": ["22.12.0", "20.18.1", "18.20.5"],
                 "url_template": {
                     "windows-x64": "https://nodejs.org/dist/v{version}/node-v{version}-win-x64.zip",
@@ -93,6 +126,8 @@ class VersionFetcher:
                 "type": "web_scrape",
                 "url": "https://golang.google.cn/dl/",
                 "version_pattern": r'go([\d.]+[A-Za-z0-9.-]*?)',
+                # 只保留href包含该子串的链接, 在解析器内部完成过滤
+                "link_filter": "/dl/go",
                 "download_base": "https://golang.google.cn"
             },
             "maven": {
@@ -118,79 +153,256 @@ class VersionFetcher:
                 },
             }
         }
+        # 平台列表按定义顺序缓存为元组, 供各循环直接遍历
+        self._platform_keys = tuple(self.platforms)
+        # 预编译平台别名匹配和文件后缀, 避免在抓取循环中重复构建
+        # 别名 -> 平台的倒排索引, 同一个别名(如amd64)可能对应多个平台
+        direct_platforms: Dict[str, set] = {}
+        for platform, cfg in self.platforms.items():
+            for alias in cfg['alias']:
+                direct_platforms.setdefault(alias.lower(), set()).add(platform)
+        # 先行断言在每个位置只捕获最长的别名, 被包含的短别名(如linux之于linux-arm64)
+        # 的平台需要并入长别名, 否则会被漏掉
+        self.alias_platforms: Dict[str, set] = {
+            alias: {platform for other, platforms in direct_platforms.items() if other in alias for platform in platforms}
+            for alias in direct_platforms
+        }
+        # 使用零宽先行断言, 一次扫描即可找出所有(包括相互重叠的)别名
+        self.platform_alias_re = re.compile(
+            '(?=(' + '|'.join(re.escape(alias) for alias in sorted(self.alias_platforms, key=len, reverse=True)) + '))',
+            re.I
+        )
+        self.platform_exts = {
+            platform: tuple('.' + ext for ext in cfg['file_types'])
+            for platform, cfg in self.platforms.items()
+        }
+        self.version_patterns = {
+            env_name: re.compile(config['version_pattern'])
+            for env_name, config in self.env_configs.items() if 'version_pattern' in config
+        }
+
+    def _load_url_cache(self) -> Dict[str, dict]:
+        """加载下载链接验证缓存"""
+        if not self.url_cache_file.exists():
+            return {}
+        try:
+            cache = orjson.loads(self.url_cache_file.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取链接缓存失败: {self.url_cache_file}, 错误: {str(e)}")
+            return {}
+        if not isinstance(cache, dict):
+            logger.warning(f"链接缓存格式无效: {self.url_cache_file}")
+            return {}
+        # 丢弃旧版本或手工修改导致字段缺失的条目
+        return {
+            url: entry for url, entry in cache.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get('ok'), bool)
+            and isinstance(entry.get('checked_at'), (int, float))
+        }
 
-    async def fetch_url(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
-        """获取URL内容"""
+    def _save_url_cache(self):
+        """保存下载链接验证缓存, 清理已过期且本次运行未用到的条目"""
+        now = time.time()
+        self.url_cache = {
+            url: entry for url, entry in self.url_cache.items()
+            if now - entry['checked_at'] < self.url_cache_ttl or url in self._inflight
+        }
+        try:
+            self.url_cache_file.write_bytes(orjson.dumps(self.url_cache, option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            logger.warning(f"保存链接缓存失败: {self.url_cache_file}, 错误: {str(e)}")
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """获取URL所在域名的并发信号量"""
+        host = urlparse(url).netloc
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.max_requests_per_host)
+        return self.host_semaphores[host]
+
+    async def _send(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False) -> httpx.Response:
+        """发送幂等请求(HEAD/GET), 连接错误或5xx/429时按指数退避重试; stream为True时不读取响应体"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._host_semaphore(url):
+                    request = self.client.build_request(method, url, headers=headers)
+                    response = await self.client.send(request, stream=stream, follow_redirects=True)
+                    if stream:
+                        await response.aclose()
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                reason = "连接错误"
+            else:
+                if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                    return response
+                reason = f"状态码: {response.status_code}"
+            delay = self.retry_backoff * 2 ** attempt
+            logger.debug(f"请求失败({reason}), {delay}秒后重试: {method} {url}")
+            await asyncio.sleep(delay)
+
+    async def fetch_url(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """获取URL响应, 成功(200)或未修改(304)时返回响应, 否则返回None"""
         logger.debug(f"开始获取URL内容: {url}")
         try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    logger.debug(f"成功获取URL内容: {url}")
-                    return content
-            logger.warning(f"获取URL失败: {url}, 状态码: {response.status}")
+            response = await self._send('GET', url, {'Accept': 'text/html', **(headers or {})})
+            if response.status_code in (200, 304):
+                logger.debug(f"成功获取URL内容: {url}, 状态码: {response.status_code}")
+                return response
+            logger.warning(f"获取URL失败: {url}, 状态码: {response.status_code}")
             return None
-        except asyncio.TimeoutError:
+        except httpx.TimeoutException:
             logger.error(f"获取URL超时: {url}")
             return None
         except Exception as e:
             logger.error(f"获取URL异常: {url}, 错误: {str(e)}")
             return None
 
-    async def verify_download_url(self, session: aiohttp.ClientSession, url: str) -> bool:
+    async def fetch_url_cached(self, url: str) -> Optional[bytes]:
+        """获取URL内容的原始字节, 网页未变化(304)时直接返回本地缓存"""
+        cache_key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        meta_file = self.page_cache_dir / f'{cache_key}.json'
+        body_file = self.page_cache_dir / f'{cache_key}.html'
+        meta = {}
+        if meta_file.exists() and body_file.exists():
+            try:
+                meta = orjson.loads(meta_file.read_bytes())
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取网页缓存失败: {meta_file}, 错误: {str(e)}")
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        response = await self.fetch_url(url, headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            logger.debug(f"网页未变化, 使用缓存: {url}")
+            return body_file.read_bytes()
+
+        try:
+            self.page_cache_dir.mkdir(exist_ok=True)
+            body_file.write_bytes(response.content)
+            meta_file.write_bytes(orjson.dumps({
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }, option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            logger.warning(f"保存网页缓存失败: {url}, 错误: {str(e)}")
+        return response.content
+
+    async def _probe_url(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """探测下载链接, HEAD被拒绝时回退到只请求一个字节的GET"""
+        headers = dict(headers or {})
+        host = urlparse(url).netloc
+        if host not in self.head_unsupported_hosts:
+            response = await self._send('HEAD', url, headers)
+            if response.status_code not in (403, 405, 501):
+                return response
+            logger.debug(f"HEAD请求被拒绝: {url}, 状态码: {response.status_code}, 改用GET请求")
+            # 403可能只是单个对象被拒绝, 只有405/501才说明整个域名不支持HEAD
+            if response.status_code in (405, 501):
+                self.head_unsupported_hosts.add(host)
+        headers['Range'] = 'bytes=0-0'
+        # 使用stream避免服务器忽略Range时下载整个文件
+        return await self._send('GET', url, headers, stream=True)
+
+    async def verify_download_url(self, url: str) -> bool:
+        """验证下载链接是否有效, 相同链接的并发验证共享同一个请求"""
+        if url in self._inflight:
+            return await self._inflight[url]
+        future = asyncio.ensure_future(self._verify_download_url(url))
+        self._inflight[url] = future
+        return await future
+
+    async def _verify_download_url(self, url: str) -> bool:
         """验证下载链接是否有效"""
         logger.debug(f"开始验证下载链接: {url}")
+        now = time.time()
+        cached = self.url_cache.get(url)
+        if cached and cached.get('ok') and now - cached.get('checked_at', 0) < self.url_cache_ttl:
+            logger.debug(f"使用缓存的验证结果: {url}")
+            return True
+
+        # 之前有效的链接带上条件请求头, 未变化时服务器直接返回304
+        headers = {}
+        if cached and cached.get('ok'):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
         try:
-            async with session.head(url, allow_redirects=True) as response:
-                is_valid = response.status == 200
-                if is_valid:
-                    logger.debug(f"下载链接有效: {url}")
-                else:
-                    logger.warning(f"下载链接无效: {url}, 状态码: {response.status}")
-                return is_valid
-        except asyncio.TimeoutError:
+            response = await self._probe_url(url, headers)
+            is_valid = response.status_code in (200, 206, 304)
+            if not is_valid:
+                logger.warning(f"下载链接无效: {url}, 状态码: {response.status_code}")
+                self.url_cache.pop(url, None)
+                return False
+            logger.debug(f"下载链接有效: {url}")
+            self.url_cache[url] = {
+                'ok': True,
+                'status': response.status_code,
+                'etag': response.headers.get('ETag') or (cached or {}).get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or (cached or {}).get('last_modified'),
+                'checked_at': now
+            }
+            return True
+        except httpx.TimeoutException:
             logger.error(f"验证下载链接超时: {url}")
             return False
         except Exception as e:
             logger.error(f"验证下载链接异常: {url}, 错误: {str(e)}")
             return False
 
-    async def verify_version_url(self, session: aiohttp.ClientSession, url: str, install_type: str = None) -> bool:
-        """验证版本下载链接是否有效"""
-        logger.debug(f"验证下载链接: {url} (类型: {install_type})")
-        try:
-            async with session.head(url, allow_redirects=True) as response:
-                if response.status == 200:
-                    logger.debug(f"下载链接有效: {url}")
-                    return True
-                else:
-                    logger.warning(f"下载链接无效: {url}, 状态码: {response.status}")
-                    return False
-        except asyncio.TimeoutError:
-            logger.error(f"验证下载链接超时: {url}")
-            return False
-        except Exception as e:
-            logger.error(f"验证下载链接异常: {url}, 错误: {str(e)}")
-            return False
+    def extract_links(self, content: bytes, link_filter: Optional[str] = None) -> List[str]:
+        """提取网页中链接的href, 优先使用selectolax, 未安装时回退到lxml; link_filter为href必须包含的子串"""
+        if HTMLParser is not None:
+            tree = HTMLParser(content)
+            # 含引号或反斜杠的过滤串无法安全放入CSS选择器, 改为取出全部链接后再按子串过滤
+            if link_filter and not any(char in link_filter for char in '"\\'):
+                selector = f'a[href*="{link_filter}"]'
+            else:
+                selector = 'a[href]'
+            hrefs = [node.attributes.get('href') for node in tree.css(selector) if node.attributes.get('href')]
+            if link_filter and selector == 'a[href]':
+                hrefs = [href for href in hrefs if link_filter in href]
+            return hrefs
+        import lxml.html
+        tree = lxml.html.fromstring(content)
+        if link_filter:
+            hrefs = tree.xpath('//a[contains(@href, $link_filter)]/@href', link_filter=link_filter)
+        else:
+            hrefs = tree.xpath('//a/@href')
+        return [str(href) for href in hrefs if href]
+
+    def match_platforms(self, href: str) -> List[str]:
+        """根据链接中的别名匹配平台, 按self.platforms的顺序返回"""
+        matched = set()
+        for match in self.platform_alias_re.finditer(href):
+            matched |= self.alias_platforms[match.group(1).lower()]
+        return [platform for platform in self._platform_keys if platform in matched]
 
     def is_valid_file(self, url: str, platform: str) -> bool:
         """检查文件类型是否对平台有效"""
-        file_type = url.split('.')[-1].lower()
-        if platform not in self.platforms:
+        if platform not in self.platform_exts:
             logger.warning(f"未知平台: {platform}, URL: {url}")
             return False
-        is_valid = file_type in self.platforms[platform]['file_types']
+        is_valid = url.lower().endswith(self.platform_exts[platform])
         if not is_valid:
-            logger.debug(f"文件类型无效: {file_type}, 平台: {platform}, URL: {url}")
+            logger.debug(f"文件类型无效, 平台: {platform}, URL: {url}")
         return is_valid
 
-    async def _get_fixed_versions(self, session: aiohttp.ClientSession, env_name: str, config: dict) -> Dict[str, Dict[str, str]]:
+    async def _get_fixed_versions(self, env_name: str, config: dict) -> Dict[str, Dict[str, str]]:
         """获取固定版本的下载链接"""
         logger.info(f"开始获取{env_name}的固定版本")
-        versions = {platform: {} for platform in self.platforms}
-        tasks = []
+        versions = {platform: {} for platform in self._platform_keys}
+        probes = []
 
-        for platform in self.platforms:
+        for platform in self._platform_keys:
             if platform not in config["url_template"]:
                 logger.warning(f"{env_name}缺少平台{platform}的URL模板")
                 continue
@@ -198,63 +410,68 @@ class VersionFetcher:
             for version in config["versions"]:
                 url = config["url_template"][platform].format(version=version)
                 logger.debug(f"添加版本检查任务: {env_name}, 平台: {platform}, 版本: {version}, URL: {url}")
-                tasks.append(self._verify_and_add_version(session, env_name, platform, str(version), url, versions))
+                probes.append((platform, str(version), url))
 
-        if not tasks:
+        if not probes:
             logger.warning(f"{env_name}没有要检查的版本")
             return versions
 
-        logger.info(f"开始并行检查{env_name}的{len(tasks)}个版本")
-        await asyncio.gather(*tasks)
+        if not config.get("verify", True):
+            for platform, version, url in probes:
+                versions[platform][version] = url
+            logger.info(f"{env_name}的链接模板无需验证, 直接使用{len(probes)}个版本")
+            return versions
+
+        # 多个平台共用同一个下载包(如maven/gradle)时每个链接只验证一次
+        urls = list(dict.fromkeys(url for _, _, url in probes))
+        logger.info(f"开始并行检查{env_name}的{len(probes)}个版本, 共{len(urls)}个不同链接")
+        results = dict(zip(urls, await asyncio.gather(*(self.verify_download_url(url) for url in urls))))
+        for platform, version, url in probes:
+            if results[url]:
+                versions[platform][version] = url
+                logger.info(f"找到有效版本: {env_name}, 平台: {platform}, 版本: {version}")
+            else:
+                logger.warning(f"版本验证失败: {env_name}, 平台: {platform}, 版本: {version}")
         logger.info(f"完成{env_name}的固定版本检查")
         return versions
 
-    async def _verify_and_add_version(self, session: aiohttp.ClientSession, env_name: str, platform: str, version: str, url: str, versions: dict):
-        """验证并添加版本"""
-        logger.debug(f"开始验证版本: {env_name}, 平台: {platform}, 版本: {version}, URL: {url}")
-        if await self.verify_download_url(session, url):
-            versions[platform][version] = url
-            logger.info(f"找到有效版本: {env_name}, 平台: {platform}, 版本: {version}")
-        else:
-            logger.warning(f"版本验证失败: {env_name}, 平台: {platform}, 版本: {version}")
-
-    async def _get_web_versions(self, session: aiohttp.ClientSession, env_name: str, config: dict) -> Dict[str, Dict[str, str]]:
+    async def _get_web_versions(self, env_name: str, config: dict) -> Dict[str, Dict[str, str]]:
         """从网页抓取版本信息"""
         logger.info(f"开始从网页获取{env_name}的版本信息: {config['url']}")
-        versions = {platform: {} for platform in self.platforms}
+        versions = {platform: {} for platform in self._platform_keys}
         
         try:
-            content = await self.fetch_url(session, config["url"])
+            content = await self.fetch_url_cached(config["url"])
             if not content:
                 logger.error(f"获取{env_name}的网页内容失败")
                 return versions
 
             logger.debug(f"开始解析{env_name}的网页内容")
-            soup = BeautifulSoup(content, 'html.parser')
-            links = soup.find_all('a', href=True)
+            links = self.extract_links(content, config.get("link_filter"))
             logger.debug(f"找到{len(links)}个链接")
             
-            version_pattern = re.compile(config["version_pattern"])
+            version_pattern = self.version_patterns[env_name]
             logger.debug(f"使用版本匹配模式: {config['version_pattern']}")
             
             # 获取所有版本号
             version_map = dict()
-            for link in links:
-                href = link['href']
+            # 每个版本号只解析一次, 解析结果直接作为排序键
+            parsed_versions: Dict[str, Version] = {}
+            for href in links:
                 match = version_pattern.search(href)
                 if match:
                     version = match.group(1)
                     version = version.strip('.')
-                    try:
-                        # 验证版本号格式
-                        parse_version(version)
-                        if version_map.get(version) is None:
-                            version_map[version] = []
-                        version_map[version].append(href)
-                        logger.debug(f"找到有效版本: {version}, URL: {href}")
-                    except InvalidVersion:
-                        logger.warning(f"无效的版本号格式: {version}, url:{href}")
-                        continue
+                    if version not in parsed_versions:
+                        try:
+                            # 验证版本号格式
+                            parsed_versions[version] = parse_version(version)
+                        except InvalidVersion:
+                            logger.warning(f"无效的版本号格式: {version}, url:{href}")
+                            continue
+                        version_map[version] = []
+                    version_map[version].append(href)
+                    logger.debug(f"找到有效版本: {version}, URL: {href}")
 
             if len(version_map.keys()) == 0:
                 logger.warning(f"{env_name}没有找到任何版本")
@@ -262,55 +479,53 @@ class VersionFetcher:
 
             logger.info(f"共找到{len(version_map.keys())}个不同版本")
             
-            # 获取每个版本的下载链接
-            valid_versions = 0
-            sorted_versions = sorted(version_map.items(), reverse=True, key=lambda v: parse_version(v[0]))
-            all_version_num = 0
-            for version, hrefs in sorted_versions:
-                # 超过了限制的最大版本数量
-                if all_version_num >= self.max_versions_per_platform:
-                    break
-
-                for href in hrefs:
-                    # 检查每个平台的版本都有了就跳过
-                    if all(versions[platform].get(version) is not None for platform in self.platforms):
-                        all_version_num += 1
-                        break
-                    try:
-                        logger.debug(f"处理版本 {version}")
-                            # 原有的处理逻辑
-                        platform_found = False
-                        for platform in self.platforms:
-                            if versions[platform].get(version) is not None:
+            # 第一遍: 只做别名和文件类型过滤, 收集待验证的(版本, 平台, 下载链接)
+            # 只需要最新的几个版本, 用堆取前K个代替全量排序
+            top_versions = heapq.nlargest(self.max_versions_per_platform, version_map.items(), key=lambda v: parsed_versions[v[0]])
+            # 每个版本的每个平台只保留第一个候选链接, 所有平台都有候选后停止扫描该版本
+            candidates = []
+            platform_count = len(self._platform_keys)
+            for version, hrefs in top_versions:
+                logger.debug(f"处理版本 {version}")
+                shortlisted = set()
+                try:
+                    for href in hrefs:
+                        for platform in self.match_platforms(href):
+                            if platform in shortlisted:
                                 continue
-                            if any(ident in href.lower() for ident in self.platforms[platform]["alias"]):
-                                logger.debug(f"通过别名匹配到平台 {platform}")
-                                if "download_base" in config:
-                                    if "filename_template" in config:
-                                        url = f"{config['download_base'].format(version=version)}/{config['filename_template'].format(version=version, suffix='zip')}"
-                                    else:
-                                        url = config["download_base"] + href
-                                else:
-                                    url = href if href.startswith('http') else config["url"] + href
-                                
-                                logger.debug(f"生成下载链接: {url}")
-                                if self.is_valid_file(url, platform) and await self.verify_version_url(session, url):
-                                    versions[platform][version] = url
-                                    platform_found = True
-                                    logger.info(f"找到{env_name} {version}版本的{platform}平台下载包: {url}")
+                            logger.debug(f"通过别名匹配到平台 {platform}")
+                            if "download_base" in config:
+                                if "filename_template" in config:
+                                    url = f"{config['download_base'].format(version=version)}/{config['filename_template'].format(version=version, suffix='zip')}"
                                 else:
-                                    logger.debug(f"下载链接无效或验证失败: {url}")
-                            
-                            if platform_found:
-                                valid_versions += 1
-                                logger.debug(f"版本 {version} 找到了有效的平台下载链接")
+                                    url = config["download_base"] + href
                             else:
-                                logger.debug(f"版本 {version} 未找到任何平台的下载链接")
-
-                    except Exception as e:
-                        logger.error(f"处理版本{version}时发生错误: {str(e)}", exc_info=True)
-                        continue
+                                url = href if href.startswith('http') else config["url"] + href
 
+                            if not self.is_valid_file(url, platform):
+                                continue
+                            logger.debug(f"生成下载链接: {url}")
+                            shortlisted.add(platform)
+                            candidates.append((version, platform, url))
+                        if len(shortlisted) == platform_count:
+                            break
+                except Exception as e:
+                    logger.error(f"处理版本{version}时发生错误: {str(e)}", exc_info=True)
+                    continue
+
+            # 第二遍: 并发验证所有候选链接
+            logger.info(f"开始并行验证{env_name}的{len(candidates)}个下载链接")
+            results = await asyncio.gather(*(self.verify_download_url(url) for _, _, url in candidates))
+            found_versions = set()
+            for (version, platform, url), is_valid in zip(candidates, results):
+                if not is_valid:
+                    logger.debug(f"下载链接无效或验证失败: {url}")
+                    continue
+                versions[platform][version] = url
+                found_versions.add(version)
+                logger.info(f"找到{env_name} {version}版本的{platform}平台下载包: {url}")
+
+            valid_versions = len(found_versions)
             logger.info(f"{env_name}共找到{valid_versions}个有效版本")
             return versions
 
@@ -327,7 +542,7 @@ class VersionFetcher:
             if version_count > 0:
                 logger.info(f"[{env_name}] 平台 {platform} 找到 {version_count} 个版本")
                 try:
-                    latest = max(platform_versions.keys(), key=lambda v: parse_version(v) if not v.startswith('v') else parse_version(v[1:]))
+                    latest = max(platform_versions, key=version_key)
                     logger.info(f"[{env_name}] 平台 {platform} 最新版本: {latest}")
                 except (ValueError, InvalidVersion) as e:
                     logger.error(f"[{env_name}] 平台 {platform} 版本解析错误: {e}")
@@ -345,17 +560,16 @@ class VersionFetcher:
 
         config = self.env_configs[env_name]
         try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                if config["type"] == "fixed_versions":
-                    versions = await self._get_fixed_versions(session, env_name, config)
-                elif config["type"] == "web_scrape":
-                    versions = await self._get_web_versions(session, env_name, config)
-                else:
-                    logger.error(f"未知的版本类型: {config['type']}")
-                    return {}
-                
-                self._log_versions(env_name, versions)
-                return versions
+            if config["type"] == "fixed_versions":
+                versions = await self._get_fixed_versions(env_name, config)
+            elif config["type"] == "web_scrape":
+                versions = await self._get_web_versions(env_name, config)
+            else:
+                logger.error(f"未知的版本类型: {config['type']}")
+                return {}
+
+            self._log_versions(env_name, versions)
+            return versions
         except Exception as e:
             logger.error(f"获取 {env_name} 版本时发生错误: {str(e)}")
             return {}
@@ -366,6 +580,7 @@ class VersionFetcher:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         logger.debug("退出 VersionFetcher 上下文")
+        self._save_url_cache()
         if exc_type:
             logger.error(f"VersionFetcher 上下文发生错误: {exc_type.__name__}: {str(exc_val)}")
 
@@ -374,20 +589,45 @@ class RepositoryUpdater:
         self.repo_file = Path(__file__).parent.parent / '.env.repository.json'
         self.config_file = Path(__file__).parent.parent / '.env.config.default.json'
 
+    def _create_client(self) -> httpx.AsyncClient:
+        """创建所有环境共享的HTTP客户端"""
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+            timeout=httpx.Timeout(5.0),
+        )
+
+    def _write_if_changed(self, path: Path, data: dict) -> bool:
+        """内容有变化时才写入文件, 返回是否写入"""
+        new_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        old_bytes = path.read_bytes() if path.exists() else b''
+        if new_bytes == old_bytes:
+            return False
+        path.write_bytes(new_bytes)
+        return True
+
     async def update(self):
         """更新所有环境的版本信息"""
         repository = {}
-        async with VersionFetcher() as fetcher:
-            for env_name in fetcher.env_configs:
-                logger.info(f"Fetching versions for {env_name}...")
-                versions = await fetcher.get_versions(env_name)
+        async with self._create_client() as client, VersionFetcher(client) as fetcher:
+            env_names = list(fetcher.env_configs)
+            logger.info(f"Fetching versions for {', '.join(env_names)}...")
+            results = await asyncio.gather(
+                *(fetcher.get_versions(env_name) for env_name in env_names),
+                return_exceptions=True
+            )
+            for env_name, versions in zip(env_names, results):
+                if isinstance(versions, BaseException):
+                    logger.error(f"获取 {env_name} 版本时发生错误: {str(versions)}")
+                    continue
                 if versions:
                     repository[env_name] = versions
 
         # 保存到文件
-        with open(self.repo_file, 'w', encoding='utf-8') as f:
-            json.dump(repository, f, indent=2)
-        logger.info(f"Repository updated and saved to {self.repo_file}")
+        if self._write_if_changed(self.repo_file, repository):
+            logger.info(f"Repository updated and saved to {self.repo_file}")
+        else:
+            logger.info(f"Repository unchanged, skip writing {self.repo_file}")
 
         # 更新默认配置
         self.update_default_config(repository)
@@ -399,8 +639,7 @@ class RepositoryUpdater:
 
         config = {}
         if self.config_file.exists():
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = orjson.loads(self.config_file.read_bytes())
 
         # 更新配置
         for env_name, versions in repository.items():
@@ -418,17 +657,19 @@ class RepositoryUpdater:
             for arg in find_env['args']:
                 if arg['name'] == 'version':
                     # 添加option version并排序
-                    vers = sorted(list(list(versions.values())[0].keys()), reverse=True, key=lambda v: parse_version(v) if not v.startswith('v') else parse_version(v[1:]))
+                    vers = sorted(next(iter(versions.values())), reverse=True, key=version_key)
 
                     arg['options'] = vers
-                    arg['default'] = max(vers, key = lambda v: parse_version(v) if not v.startswith('v') else parse_version(v[1:]))
+                    arg['default'] = vers[0]
         # 保存配置
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
-        logger.info(f"Default config updated and saved to {self.config_file}")
+        if self._write_if_changed(self.config_file, config):
+            logger.info(f"Default config updated and saved to {self.config_file}")
+        else:
+            logger.info(f"Default config unchanged, skip writing {self.config_file}")
 
 def setup_cron():
     """设置定时任务"""
+    from crontab import CronTab
     cron = CronTab(user=True)
     job = cron.new(command=f'{sys.executable} {__file__}')
     job.hour.on(0)  # 每天0点执行
@@ -443,4 +684,10 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--setup-cron':
         setup_cron()
     else:
-        asyncio.run(main())
+        # uvloop为可选依赖, 未安装(如Windows)时使用默认事件循环
+        try:
+            import uvloop
+        except ImportError:
+            asyncio.run(main())
+        else:
+            uvloop.run(main())